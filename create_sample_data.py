@@ -2,6 +2,14 @@ import h5py
 import numpy as np
 import pandas as pd
 
+try:
+    # Bitshuffle+LZ4: ~3-4x de compressao com leitura mais rapida que gzip/lzf
+    import hdf5plugin
+    STORAGE_OPTS = dict(hdf5plugin.Bitshuffle(cname='lz4'))
+except ImportError:
+    # Sem o plugin, fica no filtro nativo mais barato em CPU
+    STORAGE_OPTS = {'compression': 'lzf', 'shuffle': True}
+
 def create_sample_hdf5():
     """Create a sample HDF5 file with multiple datasets for testing"""
     
@@ -39,46 +47,53 @@ def create_sample_hdf5():
         metadata_group = f.create_group('metadata')
         
         # Add individual channel datasets
-        channel1_ds = sensors_group.create_dataset('channel_1', data=channel1)
+        channel1_ds = sensors_group.create_dataset('channel_1', data=channel1,
+                                                   chunks=(1024,), **STORAGE_OPTS)
         channel1_ds.attrs['description'] = 'Sine wave signal with noise'
         channel1_ds.attrs['units'] = 'V'
         channel1_ds.attrs['sampling_rate'] = 1000.0
         channel1_ds.attrs['sensor_type'] = 'voltage'
         
-        channel2_ds = sensors_group.create_dataset('channel_2', data=channel2)
+        channel2_ds = sensors_group.create_dataset('channel_2', data=channel2,
+                                                   chunks=(1024,), **STORAGE_OPTS)
         channel2_ds.attrs['description'] = 'Cosine wave signal'
         channel2_ds.attrs['units'] = 'V'
         channel2_ds.attrs['sampling_rate'] = 1000.0
         channel2_ds.attrs['sensor_type'] = 'voltage'
         
-        channel3_ds = sensors_group.create_dataset('channel_3', data=channel3)
+        channel3_ds = sensors_group.create_dataset('channel_3', data=channel3,
+                                                   chunks=(1024,), **STORAGE_OPTS)
         channel3_ds.attrs['description'] = 'Mixed frequency signal'
         channel3_ds.attrs['units'] = 'V'
         channel3_ds.attrs['sampling_rate'] = 1000.0
         channel3_ds.attrs['sensor_type'] = 'voltage'
         
         # Add multi-channel dataset
-        multi_ds = signals_group.create_dataset('multi_channel', data=multi_channel_data)
+        multi_ds = signals_group.create_dataset('multi_channel', data=multi_channel_data,
+                                                chunks=(1024, 3), **STORAGE_OPTS)
         multi_ds.attrs['description'] = 'Multi-channel sensor data'
         multi_ds.attrs['channels'] = ['Channel 1', 'Channel 2', 'Channel 3']
         multi_ds.attrs['units'] = 'V'
         multi_ds.attrs['sampling_rate'] = 1000.0
         
         # Add environmental data
-        temp_ds = sensors_group.create_dataset('temperature', data=temperature)
+        temp_ds = sensors_group.create_dataset('temperature', data=temperature,
+                                               chunks=(1024,), **STORAGE_OPTS)
         temp_ds.attrs['description'] = 'Temperature measurements'
         temp_ds.attrs['units'] = '°C'
         temp_ds.attrs['sensor_type'] = 'temperature'
         temp_ds.attrs['location'] = 'Room A'
         
-        pressure_ds = sensors_group.create_dataset('pressure', data=pressure)
+        pressure_ds = sensors_group.create_dataset('pressure', data=pressure,
+                                                   chunks=(1024,), **STORAGE_OPTS)
         pressure_ds.attrs['description'] = 'Atmospheric pressure'
         pressure_ds.attrs['units'] = 'hPa'
         pressure_ds.attrs['sensor_type'] = 'pressure'
         pressure_ds.attrs['location'] = 'Room A'
         
         # Add time vector
-        time_ds = f.create_dataset('time', data=time)
+        time_ds = f.create_dataset('time', data=time,
+                                   chunks=(1024,), **STORAGE_OPTS)
         time_ds.attrs['description'] = 'Time vector'
         time_ds.attrs['units'] = 'seconds'
         
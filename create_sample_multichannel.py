@@ -2,6 +2,14 @@ import h5py
 import numpy as np
 import pandas as pd
 
+try:
+    # Bitshuffle+LZ4: ~3-4x de compressao com leitura mais rapida que gzip/lzf
+    import hdf5plugin
+    STORAGE_OPTS = dict(hdf5plugin.Bitshuffle(cname='lz4'))
+except ImportError:
+    # Sem o plugin, fica no filtro nativo mais barato em CPU
+    STORAGE_OPTS = {'compression': 'lzf', 'shuffle': True}
+
 def create_sample_hdf5_file(filename="sample_multichannel_data.h5"):
     """Create a sample HDF5 file with multiple datasets and channels for testing"""
     
@@ -15,19 +23,16 @@ def create_sample_hdf5_file(filename="sample_multichannel_data.h5"):
     single_channel = np.sin(2 * np.pi * 1.5 * time_axis) + 0.1 * np.random.randn(time_points)
     
     # 2. Multi-channel sensor data (accelerometer simulation)
+    # Broadcast over (time, channel) instead of filling channel by channel
     num_channels = 8
-    multi_channel_data = np.zeros((time_points, num_channels))
-    for i in range(num_channels):
-        freq = 0.5 + i * 0.3  # Different frequencies for each channel
-        amplitude = 1.0 + i * 0.2  # Different amplitudes
-        multi_channel_data[:, i] = amplitude * np.sin(2 * np.pi * freq * time_axis) + 0.1 * np.random.randn(time_points)
-    
+    freqs = 0.5 + 0.3 * np.arange(num_channels)  # Different frequencies for each channel
+    amps = 1.0 + 0.2 * np.arange(num_channels)  # Different amplitudes
+    multi_channel_data = amps * np.sin(2 * np.pi * np.outer(time_axis, freqs)) + 0.1 * np.random.randn(time_points, num_channels)
+
     # 3. Temperature data (multiple sensors)
     temp_sensors = 4
-    temperature_data = np.zeros((time_points, temp_sensors))
-    base_temp = [20, 25, 30, 35]  # Different base temperatures
-    for i in range(temp_sensors):
-        temperature_data[:, i] = base_temp[i] + 5 * np.sin(2 * np.pi * 0.1 * time_axis) + 0.5 * np.random.randn(time_points)
+    base_temp = np.array([20, 25, 30, 35], dtype=float)  # Different base temperatures
+    temperature_data = base_temp + 5 * np.sin(2 * np.pi * 0.1 * time_axis)[:, None] + 0.5 * np.random.randn(time_points, temp_sensors)
     
     # 4. Vibration data (3-axis accelerometer)
     vibration_3axis = np.zeros((time_points, 3))
@@ -37,10 +42,8 @@ def create_sample_hdf5_file(filename="sample_multichannel_data.h5"):
     
     # 5. Pressure data (multiple locations)
     pressure_sensors = 6
-    pressure_data = np.zeros((time_points, pressure_sensors))
-    for i in range(pressure_sensors):
-        base_pressure = 1013.25 + i * 10  # Different base pressures
-        pressure_data[:, i] = base_pressure + 20 * np.sin(2 * np.pi * 0.05 * time_axis) + 2 * np.random.randn(time_points)
+    base_pressure = 1013.25 + 10 * np.arange(pressure_sensors)  # Different base pressures
+    pressure_data = base_pressure + 20 * np.sin(2 * np.pi * 0.05 * time_axis)[:, None] + 2 * np.random.randn(time_points, pressure_sensors)
     
     # Create HDF5 file
     with h5py.File(filename, 'w') as f:
@@ -51,14 +54,16 @@ def create_sample_hdf5_file(filename="sample_multichannel_data.h5"):
         
         # Add datasets with attributes
         # Single channel data
-        ds1 = signals_group.create_dataset('sine_wave', data=single_channel)
+        ds1 = signals_group.create_dataset('sine_wave', data=single_channel,
+                                       chunks=(min(4096, time_points),), **STORAGE_OPTS)
         ds1.attrs['description'] = 'Single channel sine wave with noise'
         ds1.attrs['frequency'] = 1.5
         ds1.attrs['sampling_rate'] = time_points / 10.0
         ds1.attrs['units'] = 'V'
         
         # Multi-channel sensor data
-        ds2 = sensors_group.create_dataset('multi_sensor', data=multi_channel_data)
+        ds2 = sensors_group.create_dataset('multi_sensor', data=multi_channel_data,
+                                       chunks=(min(4096, time_points), num_channels), **STORAGE_OPTS)
         ds2.attrs['description'] = 'Multi-channel sensor data'
         ds2.attrs['channels'] = num_channels
         ds2.attrs['sampling_rate'] = time_points / 10.0
@@ -66,26 +71,30 @@ def create_sample_hdf5_file(filename="sample_multichannel_data.h5"):
         ds2.attrs['channel_names'] = [f'Sensor_{i+1}' for i in range(num_channels)]
         
         # Temperature data
-        ds3 = environmental_group.create_dataset('temperature', data=temperature_data)
+        ds3 = environmental_group.create_dataset('temperature', data=temperature_data,
+                                             chunks=(min(4096, time_points), temp_sensors), **STORAGE_OPTS)
         ds3.attrs['description'] = 'Temperature measurements from multiple sensors'
         ds3.attrs['units'] = 'Celsius'
         ds3.attrs['sensor_locations'] = ['Room_A', 'Room_B', 'Room_C', 'Room_D']
         
         # Vibration data
-        ds4 = sensors_group.create_dataset('vibration_3axis', data=vibration_3axis)
+        ds4 = sensors_group.create_dataset('vibration_3axis', data=vibration_3axis,
+                                       chunks=(min(4096, time_points), 3), **STORAGE_OPTS)
         ds4.attrs['description'] = '3-axis accelerometer data'
         ds4.attrs['units'] = 'g'
         ds4.attrs['axes'] = ['X', 'Y', 'Z']
         ds4.attrs['sampling_rate'] = time_points / 10.0
         
         # Pressure data
-        ds5 = environmental_group.create_dataset('pressure', data=pressure_data)
+        ds5 = environmental_group.create_dataset('pressure', data=pressure_data,
+                                             chunks=(min(4096, time_points), pressure_sensors), **STORAGE_OPTS)
         ds5.attrs['description'] = 'Pressure measurements from multiple locations'
         ds5.attrs['units'] = 'hPa'
         ds5.attrs['sensor_count'] = pressure_sensors
         
         # Add time axis as reference
-        time_ds = f.create_dataset('time_axis', data=time_axis)
+        time_ds = f.create_dataset('time_axis', data=time_axis,
+                               chunks=(min(4096, time_points),), **STORAGE_OPTS)
         time_ds.attrs['description'] = 'Time axis for all measurements'
         time_ds.attrs['units'] = 'seconds'
         
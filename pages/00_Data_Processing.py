@@ -1,13 +1,33 @@
 import streamlit as st
 import h5py
+import hashlib
 import pandas as pd
 import numpy as np
 import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz do projeto ao PATH
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from utils.downsample import MAX_PLOT_POINTS, decimate_for_plot, minmax_envelope
+
+try:
+    # Registers SIMD-accelerated Blosc/Zstd/LZ4 decompression filters, so
+    # files written with those plugins open transparently
+    import hdf5plugin  # noqa: F401
+except ImportError:
+    pass
 
 # st.set_page_config(page_title="HDF5 Viewer", layout="wide", page_icon="📊")
 
@@ -42,17 +62,64 @@ with st.sidebar:
     chart_height = st.slider("Chart Height", 300, 800, 500)
 
 # Helper functions
-def list_datasets_only(h5obj, prefix=""):
-    """List only datasets (not groups) recursively"""
+def list_datasets_only(h5obj):
+    """List only datasets (not groups) recursively.
+
+    visititems walks the hierarchy inside h5py's C layer and hands back
+    already-joined paths, avoiding the per-key object reopen of a Python
+    recursion.
+    """
     datasets = []
-    for key in h5obj:
-        path = f"{prefix}/{key}" if prefix else key
-        if isinstance(h5obj[key], h5py.Dataset):
-            datasets.append(path)
-        elif isinstance(h5obj[key], h5py.Group):
-            datasets.extend(list_datasets_only(h5obj[key], path))
+    h5obj.visititems(
+        lambda name, obj: datasets.append(name) if isinstance(obj, h5py.Dataset) else None
+    )
     return datasets
 
+def open_with_tuned_cache(h5_path):
+    """Open an HDF5 file with a chunk cache sized to its largest chunk.
+
+    The default 1 MB raw chunk cache thrashes as soon as one chunk exceeds
+    it, forcing re-reads and re-decompression on every slice; probe the
+    chunk layout first and reopen with a cache that fits the working set.
+    """
+    with h5py.File(h5_path, "r") as probe:
+        chunk_bytes = [int(np.prod(ds.chunks)) * ds.dtype.itemsize
+                       for ds in (probe[p] for p in list_datasets_only(probe))
+                       if ds.chunks]
+    max_chunk_bytes = max(chunk_bytes, default=0)
+    rdcc_nbytes = max(max_chunk_bytes * 16, 128 * 1024 * 1024)
+    # rdcc_w0=1.0: fully-read chunks are preferred for eviction only after
+    # others, so tab switches never re-decompress the same chunk
+    return h5py.File(h5_path, "r", rdcc_nbytes=rdcc_nbytes, rdcc_nslots=100003, rdcc_w0=1.0)
+
+@st.cache_data(show_spinner=False)
+def list_datasets_cached(file_key, h5_path):
+    """List dataset paths once per uploaded file.
+
+    file_key is a hash of the file content, so widget-driven reruns skip
+    the full hierarchy walk and hit the cache instead.
+    """
+    with h5py.File(h5_path, "r") as hdf:
+        return list_datasets_only(hdf)
+
+def load_dataset_limited(dataset, max_samples=None):
+    """Read a dataset into a preallocated buffer, limited to the first rows.
+
+    read_direct issues a single H5Dread into the target array instead of
+    materializing the full dataset before truncation.
+    """
+    if dataset.ndim == 0 or dataset.dtype.kind not in 'biufc':
+        # Scalars and non-numeric types keep the generic h5py path
+        return dataset[()]
+    if max_samples and dataset.shape[0] > max_samples:
+        target_shape = (max_samples,) + dataset.shape[1:]
+        data = np.empty(target_shape, dtype=dataset.dtype)
+        dataset.read_direct(data, source_sel=np.s_[:max_samples])
+    else:
+        data = np.empty(dataset.shape, dtype=dataset.dtype)
+        dataset.read_direct(data)
+    return data
+
 def get_dataset_info(dataset):
     """Get detailed information about a dataset"""
     return {
@@ -64,6 +131,39 @@ def get_dataset_info(dataset):
         'Chunks': dataset.chunks
     }
 
+def iter_chunks(dataset):
+    """Enumerate stored chunk info for a chunked dataset.
+
+    Uses chunk_iter (HDF5 >= 1.12.3), which walks the chunk index once;
+    the indexed get_chunk_info fallback degrades to O(N^2) on files with
+    many chunks, so it is only used on older libraries.
+    """
+    chunk_infos = []
+    try:
+        dataset.id.chunk_iter(chunk_infos.append)
+    except AttributeError:
+        ds_id = dataset.id
+        chunk_infos = [ds_id.get_chunk_info(i) for i in range(ds_id.get_num_chunks())]
+    return chunk_infos
+
+def viz_cast(a):
+    """Downcast float64 to float32 for display-bound consumers.
+
+    Plots and summary statistics don't benefit from float64 precision,
+    and float32 halves the bytes moved; exports keep the original data.
+    """
+    return a.astype(np.float32, copy=False) if a.dtype == np.float64 else a
+
+@st.cache_data(show_spinner=False)
+def dataframe_to_csv(df):
+    """Serialize a DataFrame to CSV once per content.
+
+    Widget interactions rerun the whole script; without caching, every
+    rerun would re-materialize the CSV string even though the data is
+    unchanged. %.6g keeps float columns compact in the export.
+    """
+    return df.to_csv(index=False, float_format="%.6g")
+
 def is_plottable(data):
     """Check if data can be plotted"""
     if not isinstance(data, np.ndarray):
@@ -74,13 +174,26 @@ def is_plottable(data):
         return False
     return True
 
+def is_plottable_meta(dataset):
+    """Decide plottability from the h5py handle alone, before any read.
+
+    Same rules as is_plottable, but applied to shape/dtype metadata so
+    unusable datasets (strings, compound types, >2-D) are never loaded.
+    """
+    return dataset.dtype.kind in 'iufc' and dataset.ndim <= 2
+
 def create_time_series_plot(data, column_names, title="Time Series Data"):
     """Create interactive time series plot"""
     fig = go.Figure()
-    
+
+    # LTTB-downsample each trace so the figure payload stays bounded
+    sample_index = np.arange(data.shape[0], dtype=np.float64)
+
     if data.ndim == 1:
+        x_plot, y_plot = decimate_for_plot(sample_index, data)
         fig.add_trace(go.Scatter(
-            y=data,
+            x=x_plot,
+            y=y_plot,
             mode='lines',
             name=column_names[0] if column_names else 'Channel 1',
             line=dict(width=2)
@@ -88,8 +201,10 @@ def create_time_series_plot(data, column_names, title="Time Series Data"):
     else:
         for i, col_name in enumerate(column_names):
             if i < data.shape[1]:
+                x_plot, y_plot = decimate_for_plot(sample_index, data[:, i])
                 fig.add_trace(go.Scatter(
-                    y=data[:, i],
+                    x=x_plot,
+                    y=y_plot,
                     mode='lines',
                     name=col_name,
                     line=dict(width=2)
@@ -123,8 +238,17 @@ def create_histogram_plot(data, column_names):
         else:
             hist_data = data[:, i] if i < data.shape[1] else data[:, 0]
         
+        # Drop NaN/inf before binning: np.histogram raises on a non-finite
+        # autodetected range, while go.Histogram used to drop them client-side
+        hist_data = hist_data[np.isfinite(hist_data)]
+        if hist_data.size == 0:
+            continue
+
+        # Bin server-side: the browser receives 50 bars instead of N samples
+        counts, edges = np.histogram(hist_data, bins=50)
         fig.add_trace(
-            go.Histogram(x=hist_data, name=col_name, nbinsx=50, showlegend=False),
+            go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                   name=col_name, showlegend=False),
             row=1, col=i+1
         )
     
@@ -140,8 +264,9 @@ def create_correlation_heatmap(data, column_names):
     if data.ndim != 2 or data.shape[1] < 2:
         return None
     
-    df = pd.DataFrame(data, columns=column_names)
-    correlation_matrix = df.corr()
+    # BLAS-backed correlation on the raw array; pandas only labels the CxC result
+    mat = np.corrcoef(np.ascontiguousarray(data), rowvar=False)
+    correlation_matrix = pd.DataFrame(mat, index=column_names, columns=column_names)
     
     fig = px.imshow(
         correlation_matrix,
@@ -157,15 +282,27 @@ def create_correlation_heatmap(data, column_names):
 uploaded_file = st.file_uploader("📁 Upload an HDF5 file", type=["h5", "hdf5"])
 
 if uploaded_file is not None:
-    # Save temporarily
-    with open("temp_file.h5", "wb") as f:
-        f.write(uploaded_file.read())
+    # Per-session temp path, so concurrent sessions don't clobber each other
+    if "temp_h5_path" not in st.session_state:
+        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".h5")
+        tmp.close()
+        st.session_state["temp_h5_path"] = tmp.name
+    tmp_path = st.session_state["temp_h5_path"]
 
-    # Open file with h5py
-    with h5py.File("temp_file.h5", "r") as hdf:
-        
-        # Get all datasets
-        all_datasets = list_datasets_only(hdf)
+    # Stream the upload to disk in 8 MB blocks instead of materializing
+    # the whole file as a bytes object
+    uploaded_file.seek(0)
+    with open(tmp_path, "wb") as f:
+        shutil.copyfileobj(uploaded_file, f, length=8 * 1024 * 1024)
+
+    # Content hash used as cache key for structure discovery
+    file_key = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+
+    # Open file with h5py, chunk cache tuned to the file's chunk layout
+    with open_with_tuned_cache(tmp_path) as hdf:
+
+        # Get all datasets (cached per uploaded file)
+        all_datasets = list_datasets_cached(file_key, tmp_path)
         
         if not all_datasets:
             st.error("No datasets found in the HDF5 file.")
@@ -210,36 +347,82 @@ if uploaded_file is not None:
                     datasets_data = {}
                     datasets_info = {}
                     
+                    # Session-level cache of loaded arrays: widget reruns become
+                    # dict lookups instead of repeated HDF5 reads
+                    data_cache = st.session_state.setdefault("_data_cache", {})
+                    limit = max_samples if use_sample_limit else None
+
+                    # Resolve session-cache hits first, then load the misses in
+                    # parallel: h5py releases the GIL during reads, so separate
+                    # datasets overlap I/O and decompression across threads
+                    to_load = []
+                    skipped_datasets = {}
                     for dataset_path in selected_datasets:
-                        try:
-                            dataset = hdf[dataset_path]
-                            data = dataset[()]
-                            
-                            # Apply sample limit if enabled
-                            if use_sample_limit and isinstance(data, np.ndarray) and data.size > max_samples:
-                                if data.ndim == 1:
-                                    data = data[:max_samples]
-                                elif data.ndim == 2:
-                                    data = data[:max_samples, :]
-                            
-                            datasets_data[dataset_path] = data
-                            datasets_info[dataset_path] = get_dataset_info(dataset)
-                            
-                        except Exception as e:
-                            st.error(f"Error loading dataset {dataset_path}: {e}")
-                    
-                    if datasets_data:
+                        ds = hdf[dataset_path]
+                        if not is_plottable_meta(ds):
+                            # Ruled out by metadata: don't pull the data in at all
+                            skipped_datasets[dataset_path] = (ds.shape, ds.dtype)
+                            continue
+                        cache_key = (file_key, dataset_path, limit)
+                        if cache_key in data_cache:
+                            # Touch: move to most-recently-used position
+                            datasets_data[dataset_path] = data_cache.pop(cache_key)
+                            data_cache[cache_key] = datasets_data[dataset_path]
+                        else:
+                            to_load.append(dataset_path)
+
+                    if to_load:
+                        with ThreadPoolExecutor(max_workers=min(8, len(to_load))) as executor:
+                            futures = {executor.submit(load_dataset_limited, hdf[path], limit): path
+                                       for path in to_load}
+                            for future in as_completed(futures):
+                                dataset_path = futures[future]
+                                try:
+                                    data = future.result()
+                                except Exception as e:
+                                    st.error(f"Error loading dataset {dataset_path}: {e}")
+                                    continue
+                                # Keep at most 8 arrays resident (evict oldest)
+                                while len(data_cache) >= 8:
+                                    data_cache.pop(next(iter(data_cache)))
+                                data_cache[(file_key, dataset_path, limit)] = data
+                                datasets_data[dataset_path] = data
+
+                    datasets_attrs = {}
+                    for dataset_path in selected_datasets:
+                        if dataset_path in datasets_data or dataset_path in skipped_datasets:
+                            ds = hdf[dataset_path]
+                            datasets_info[dataset_path] = get_dataset_info(ds)
+                            # Snapshot attributes while the handle is already open;
+                            # the attributes tab then renders plain dicts with no
+                            # further HDF5 lookups
+                            datasets_attrs[dataset_path] = {
+                                key: (value.decode("utf-8", "replace") if isinstance(value, bytes) else value)
+                                for key, value in ds.attrs.items()
+                            }
+
+                    if datasets_data or skipped_datasets:
                         # Dataset Information
                         st.subheader("📋 Dataset Information")
-                        info_cols = st.columns(min(len(datasets_data), 3))
-                        
+                        info_cols = st.columns(min(max(len(datasets_info), 1), 3))
+
                         for i, (path, info) in enumerate(datasets_info.items()):
-                            with info_cols[i % 3]:
+                            with info_cols[i % len(info_cols)]:
                                 with st.container():
                                     st.markdown(f"**{path.split('/')[-1]}**")
                                     st.metric("Shape", str(info['Shape']))
                                     st.metric("Size", f"{info['Size']:,}")
                                     st.caption(f"Type: {info['Dtype']}")
+                                    if info['Chunks']:
+                                        with st.expander("🧱 Chunk map"):
+                                            # Only enumerate chunks on demand
+                                            if st.checkbox("Enumerate chunks", key=f"chunk_map_{i}"):
+                                                chunk_df = pd.DataFrame(
+                                                    [(str(ci.chunk_offset), ci.byte_offset, ci.size)
+                                                     for ci in iter_chunks(hdf[path])],
+                                                    columns=["Offset", "Byte Offset", "Bytes"]
+                                                )
+                                                st.dataframe(chunk_df, use_container_width=True)
                         
                         # Plotting section
                         st.subheader("📈 Data Visualization")
@@ -247,8 +430,8 @@ if uploaded_file is not None:
                         # Handle single vs multiple datasets
                         if len(selected_datasets) == 1:
                             dataset_path = selected_datasets[0]
-                            data = datasets_data[dataset_path]
-                            
+                            data = datasets_data.get(dataset_path)
+
                             if is_plottable(data):                                # Generate column names and channel selection
                                 if data.ndim == 1:
                                     column_names = [dataset_path.split('/')[-1]]
@@ -279,7 +462,19 @@ if uploaded_file is not None:
                                 else:
                                     filtered_data = data
                                     selected_channels = column_names
-                                  # Create tabs for different visualizations
+                                # float32 is enough for the plot/statistics tabs below;
+                                # the raw-data preview and CSV export keep full precision
+                                filtered_data = viz_cast(filtered_data)
+
+                                # One DataFrame shared by the tabs below, wrapping the
+                                # numpy buffer without copying it per tab
+                                shared_df = pd.DataFrame(
+                                    filtered_data if filtered_data.ndim == 2 else filtered_data[:, None],
+                                    columns=column_names if filtered_data.ndim == 2 else [column_names[0]],
+                                    copy=False
+                                )
+
+                                # Create tabs for different visualizations
                                 plot_tabs = st.tabs(["📊 Time Series", "📈 Histogram", "🔥 Heatmap", "📋 Statistics"])
                                 
                                 with plot_tabs[0]:
@@ -293,10 +488,14 @@ if uploaded_file is not None:
                                         fig.update_layout(height=chart_height)
                                         st.plotly_chart(fig, use_container_width=True)
                                     elif plot_type == "Box Plot":
-                                        df = pd.DataFrame(filtered_data, columns=column_names if filtered_data.ndim == 2 else [column_names[0]])
-                                        fig = px.box(df.melt(), x='variable', y='value', 
-                                                   title=f"Box Plot: {dataset_path}")
-                                        fig.update_layout(height=chart_height)
+                                        # One Box trace per column straight from the numpy view,
+                                        # skipping the pandas melt copy; boxpoints=False keeps
+                                        # the raw samples out of the browser payload
+                                        fig = go.Figure()
+                                        for j, col_name in enumerate(column_names):
+                                            col_values = filtered_data[:, j] if filtered_data.ndim == 2 else filtered_data
+                                            fig.add_trace(go.Box(y=col_values, name=col_name, boxpoints=False))
+                                        fig.update_layout(title=f"Box Plot: {dataset_path}", height=chart_height)
                                         st.plotly_chart(fig, use_container_width=True)
                                 
                                 with plot_tabs[1]:
@@ -313,7 +512,7 @@ if uploaded_file is not None:
                                 
                                 with plot_tabs[3]:
                                     if show_statistics:
-                                        df = pd.DataFrame(filtered_data, columns=column_names if filtered_data.ndim == 2 else [column_names[0]])
+                                        df = shared_df
                                         st.subheader("📊 Statistical Summary")
                                         st.dataframe(df.describe(), use_container_width=True)
                                         
@@ -325,6 +524,11 @@ if uploaded_file is not None:
                                         with stat_col2:
                                             st.metric("Columns", len(df.columns))
                                             st.metric("Missing Values", df.isnull().sum().sum())
+                            elif dataset_path in skipped_datasets:
+                                # Only metadata is available for skipped datasets
+                                shape, dtype = skipped_datasets[dataset_path]
+                                st.warning("Selected dataset is not suitable for plotting")
+                                st.caption(f"shape={shape}, dtype={dtype}")
                             else:
                                 st.warning("Selected dataset is not suitable for plotting")
                                 st.write("Data preview:", data)
@@ -336,15 +540,42 @@ if uploaded_file is not None:
                             # Create comparison plots
                             fig = go.Figure()
                             
-                            for dataset_path in selected_datasets:
-                                data = datasets_data[dataset_path]
+                            palette = px.colors.qualitative.Plotly
+                            for k, dataset_path in enumerate(selected_datasets):
+                                data = datasets_data.get(dataset_path)
                                 if is_plottable(data) and data.ndim == 1:
-                                    fig.add_trace(go.Scatter(
-                                        y=data,
-                                        mode='lines',
-                                        name=dataset_path.split('/')[-1],
-                                        line=dict(width=2)
-                                    ))
+                                    name = dataset_path.split('/')[-1]
+                                    color = palette[k % len(palette)]
+                                    y = np.ascontiguousarray(data, dtype=np.float64)
+                                    if y.size > 2 * MAX_PLOT_POINTS:
+                                        # Min/max envelope: the browser gets 2*n_buckets
+                                        # points per dataset instead of the full series,
+                                        # while spikes remain visible
+                                        lo, hi = minmax_envelope(y, MAX_PLOT_POINTS)
+                                        x = (np.arange(MAX_PLOT_POINTS) + 0.5) * (y.size / MAX_PLOT_POINTS)
+                                        fig.add_trace(go.Scattergl(
+                                            x=x, y=hi,
+                                            mode='lines',
+                                            name=name,
+                                            legendgroup=name,
+                                            line=dict(width=1, color=color)
+                                        ))
+                                        fig.add_trace(go.Scattergl(
+                                            x=x, y=lo,
+                                            mode='lines',
+                                            name=name,
+                                            legendgroup=name,
+                                            showlegend=False,
+                                            fill='tonexty',
+                                            line=dict(width=1, color=color)
+                                        ))
+                                    else:
+                                        fig.add_trace(go.Scattergl(
+                                            y=y,
+                                            mode='lines',
+                                            name=name,
+                                            line=dict(width=2, color=color)
+                                        ))
                             
                             fig.update_layout(
                                 title="Multi-Dataset Comparison",
@@ -361,6 +592,10 @@ if uploaded_file is not None:
                             st.subheader("📄 Raw Data Preview")
                             for dataset_path in selected_datasets:
                                 with st.expander(f"Data from {dataset_path}"):
+                                    if dataset_path in skipped_datasets:
+                                        shape, dtype = skipped_datasets[dataset_path]
+                                        st.caption(f"Not loaded: shape={shape}, dtype={dtype}")
+                                        continue
                                     data = datasets_data[dataset_path]
                                     if isinstance(data, np.ndarray):
                                         if data.ndim == 1:
@@ -368,12 +603,12 @@ if uploaded_file is not None:
                                         elif data.ndim == 2:
                                             df = pd.DataFrame(data, columns=[f"Col_{i}" for i in range(data.shape[1])])
                                         else:
-                                            df = pd.DataFrame({"Values": data.flatten()[:1000]})  # Flatten for display
+                                            df = pd.DataFrame({"Values": data.reshape(-1)[:1000]})  # View, not a full copy
                                         
                                         st.dataframe(df.head(1000), use_container_width=True)
                                         
                                         # Download button
-                                        csv = df.to_csv(index=False)
+                                        csv = dataframe_to_csv(df)
                                         st.download_button(
                                             label=f"⬇️ Download {dataset_path.split('/')[-1]} as CSV",
                                             data=csv,
@@ -389,20 +624,13 @@ if uploaded_file is not None:
                         
                         for i, dataset_path in enumerate(selected_datasets):
                             with attr_tabs[i]:
-                                obj = hdf[dataset_path]
-                                if hasattr(obj, "attrs") and obj.attrs:
-                                    attr_data = {}
-                                    for key in obj.attrs.keys():
-                                        value = obj.attrs[key]
-                                        if isinstance(value, bytes):
-                                            value = value.decode("utf-8")
-                                        attr_data[key] = value
-                                    
+                                attr_data = datasets_attrs.get(dataset_path)
+                                if attr_data:
                                     df_attrs = pd.DataFrame(attr_data.items(), columns=["Attribute", "Value"])
                                     st.dataframe(df_attrs, use_container_width=True)
                                     
                                     # Download attributes
-                                    csv = df_attrs.to_csv(index=False)
+                                    csv = dataframe_to_csv(df_attrs)
                                     st.download_button(
                                         label=f"⬇️ Download Attributes",
                                         data=csv,
@@ -416,8 +644,8 @@ if uploaded_file is not None:
                     st.info("👆 Please select at least one dataset to analyze")
     
     # Cleanup
-    if os.path.exists("temp_file.h5"):
-        os.remove("temp_file.h5")
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
 
 else:
     # Welcome message when no file is uploaded
@@ -5,8 +5,28 @@ import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+import hashlib
 import os
+import posixpath
+import shutil
+import tempfile
 from datetime import datetime
+import sys
+from pathlib import Path
+from numba import njit, prange
+
+# Adiciona o diretório raiz do projeto ao PATH
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from utils.downsample import MAX_PLOT_POINTS, lttb
+
+try:
+    # Registra os filtros Blosc/Zstd/LZ4 (SIMD) para arquivos comprimidos
+    import hdf5plugin  # noqa: F401
+except ImportError:
+    pass
 
 # # Configuração da página
 # st.set_page_config(
@@ -69,23 +89,35 @@ with st.sidebar:
     else:
         max_samples = None
 
+@njit(cache=True)
+def _is_monotonic(col):
+    """Verifica se a coluna é não-decrescente, parando no primeiro par decrescente"""
+    for i in range(1, col.size):
+        if col[i] < col[i - 1]:
+            return False
+    return True
+
 # Função para encontrar datasets temporais
 def find_temporal_datasets(h5obj, prefix=""):
     """Encontra datasets 2D onde primeira coluna é tempo e demais são dados"""
     temporal_datasets = []
     
     for key in h5obj:
-        path = f"{prefix}/{key}" if prefix else key
+        # posixpath.join é implementado em C; intern faz os lookups
+        # posteriores (hdf[path], dicts) compararem por ponteiro
+        path = sys.intern(posixpath.join(prefix, key) if prefix else key)
         item = h5obj[key]
         
         if isinstance(item, h5py.Dataset):
-            # Verifica se é 2D e tem pelo menos 2 colunas
-            if item.ndim == 2 and item.shape[1] >= 2:
+            # Verifica se é 2D numérico com pelo menos 2 colunas; datasets de
+            # strings passariam na checagem de monotonicidade por ordem lexical
+            if item.ndim == 2 and item.shape[1] >= 2 and item.dtype.kind in 'iuf':
                 # Verifica se parece ser dados temporais
                 try:
-                    data_sample = item[:min(100, item.shape[0]), :]
+                    # Lê apenas a coluna de tempo (hyperslab de uma coluna)
+                    time_sample = item[:min(100, item.shape[0]), 0]
                     # Primeira coluna deve ser crescente (assumindo tempo)
-                    if np.all(np.diff(data_sample[:, 0]) >= 0):
+                    if _is_monotonic(time_sample):
                         temporal_datasets.append({
                             'path': path,
                             'shape': item.shape,
@@ -99,10 +131,64 @@ def find_temporal_datasets(h5obj, prefix=""):
     
     return temporal_datasets
 
-def get_channel_names(dataset, dataset_path):
-    """Gera nomes para os canais baseado nos atributos ou padrão"""
+@st.cache_resource(show_spinner=False)
+def open_h5_file(file_key, h5_path):
+    """Mantém um único handle h5py aberto por arquivo durante a sessão.
+
+    Evita reabrir o arquivo (e reaquecer o cache de metadados do HDF5) a
+    cada rerun; o chunk cache ampliado mantém fatias relidas em memória.
+    """
+    # rdcc_w0=1.0: chunks relidos nunca são descomprimidos de novo enquanto
+    # couberem no cache
+    return h5py.File(h5_path, "r", rdcc_nbytes=64 * 1024 * 1024, rdcc_nslots=1_000_003,
+                     rdcc_w0=1.0)
+
+@st.cache_data(show_spinner=False)
+def scan_temporal_datasets(file_key, h5_path):
+    """Varre o arquivo HDF5 e retorna os metadados dos datasets temporais.
+
+    file_key identifica o conteúdo do arquivo para o cache: interações com
+    widgets (sliders, checkboxes) não disparam nova varredura do arquivo.
+    """
+    return find_temporal_datasets(open_h5_file(file_key, h5_path))
+
+@st.cache_data(show_spinner=False)
+def load_dataset_payload(file_key, h5_path, dataset_path, max_samples, channel_indices=None):
+    """Carrega (tempo, canais) de um dataset temporal, respeitando o limite.
+
+    channel_indices é uma tupla ordenada de índices de canais (base 0, sem
+    contar a coluna de tempo); None carrega todos os canais. Cacheado por
+    (conteúdo do arquivo, caminho, limite, canais): reruns causados por
+    widgets reutilizam os arrays já lidos em vez de reler o HDF5.
+    """
+    dataset = open_h5_file(file_key, h5_path)[dataset_path]
+    n_rows = dataset.shape[0]
+    if max_samples and n_rows > max_samples:
+        # Lê apenas as amostras necessárias do HDF5 (otimização de memória)
+        n_rows = max_samples
+    if channel_indices is not None and len(channel_indices) < dataset.shape[1] - 1:
+        # Hyperslab de colunas: lê só a coluna de tempo e os canais pedidos
+        col_sel = [0] + [i + 1 for i in channel_indices]
+        data = dataset[:n_rows, col_sel]
+    else:
+        # read_direct faz um único H5Dread no buffer pré-alocado
+        data = np.empty((n_rows, dataset.shape[1]), dtype=dataset.dtype)
+        dataset.read_direct(data, source_sel=np.s_[:n_rows, :])
+    # Cópias C-contíguas: as reduções NumPy/Numba seguintes (estatísticas,
+    # LTTB) usam o caminho rápido em vez do layout com stride
+    return np.ascontiguousarray(data[:, 0]), np.ascontiguousarray(data[:, 1:])
+
+@st.cache_data(show_spinner=False)
+def get_channel_names(file_key, h5_path, dataset_path):
+    """Gera nomes para os canais baseado nos atributos ou padrão.
+
+    Cacheado por arquivo e dataset: evita reler e decodificar os atributos
+    HDF5 a cada rerun.
+    """
     channel_names = []
-    
+
+    dataset = open_h5_file(file_key, h5_path)[dataset_path]
+
     # Tenta obter nomes dos atributos
     if 'channel_names' in dataset.attrs:
         try:
@@ -111,32 +197,43 @@ def get_channel_names(dataset, dataset_path):
                 channel_names = [str(name) for name in names]
         except:
             pass
-    
+
     # Se não conseguiu obter nomes, gera nomes padrão
     if not channel_names:
         num_channels = dataset.shape[1] - 1
         channel_names = [f"Canal {i+1}" for i in range(num_channels)]
-    
+
     return channel_names
 
-def create_time_series_plot(time_data, channels_data, channel_names, selected_channels, samples_info=""):
+def create_time_series_plot(time_data, channels_data, name_to_idx, selected_channels, samples_info=""):
     """Cria gráfico de séries temporais interativo"""
-    fig = go.Figure()
-    
-    for i, channel_name in enumerate(selected_channels):
-        channel_idx = channel_names.index(channel_name)
-        fig.add_trace(go.Scatter(
-            x=time_data,
-            y=channels_data[:, channel_idx],
-            mode='lines',
-            name=channel_name,
-            line=dict(width=line_width),
-            hovertemplate=f'<b>{channel_name}</b><br>' +
-                         'Tempo: %{x}<br>' +
-                         'Valor: %{y}<br>' +
-                         '<extra></extra>'
-        ))
-    
+    # Monta um DataFrame longo (tempo, valor, canal) e deixa o px.line
+    # construir todos os traces de uma vez, em vez de um add_trace por canal
+    frames = []
+    for channel_name in selected_channels:
+        channel_idx = name_to_idx[channel_name]
+        y_data = channels_data[:, channel_idx]
+        if time_data.size > MAX_PLOT_POINTS:
+            # Decima via LTTB: o gráfico fica O(MAX_PLOT_POINTS), não O(N)
+            x_plot, y_plot = lttb(np.ascontiguousarray(time_data),
+                                  np.ascontiguousarray(y_data),
+                                  MAX_PLOT_POINTS)
+        else:
+            x_plot, y_plot = time_data, y_data
+        # float32 basta para os valores na resolução de tela; o tempo fica em
+        # float64 — bases grandes (ex.: epoch) colapsariam em degraus de ~128 s
+        # com 7 dígitos significativos, e após o LTTB são só 2000 pontos por canal
+        frames.append(pd.DataFrame({'Tempo': np.asarray(x_plot, dtype=np.float64),
+                                    'Valor': y_plot.astype(np.float32, copy=False),
+                                    'Canal': channel_name}))
+
+    plot_df = pd.concat(frames, ignore_index=True)
+    # Acima de ~5k pontos o SVG fica lento no navegador; WebGL (Scattergl)
+    # desenha tudo em um único canvas
+    render_mode = 'webgl' if len(plot_df) > 5000 else 'svg'
+    fig = px.line(plot_df, x='Tempo', y='Valor', color='Canal', render_mode=render_mode)
+    fig.update_traces(line=dict(width=line_width))
+
     title_text = "Séries Temporais - Canais Selecionados"
     if samples_info:
         title_text += f" ({samples_info})"
@@ -155,23 +252,81 @@ def create_time_series_plot(time_data, channels_data, channel_names, selected_ch
     
     return fig
 
+@st.cache_data(show_spinner=False)
+def dataframe_to_csv(df):
+    """Serializa o DataFrame em CSV uma única vez por conteúdo.
+
+    A serialização é O(N·M) em Python; o cache evita refazê-la a cada
+    rerun causado por widgets que não alteram os dados.
+    """
+    return df.to_csv(index=False)
+
+# A partir de quantos canais vale a pena o kernel paralelo
+WIDE_CHANNEL_THRESHOLD = 16
+
+@njit(parallel=True, cache=True)
+def _channel_stats(data):
+    """Reduções por canal (média, desvio, mín, máx, mediana, variância).
+
+    Cada canal é reduzido em um único laço escalar dentro de prange,
+    distribuindo os canais entre os núcleos. Espera matriz C-contígua.
+    """
+    n, c = data.shape
+    out = np.empty((c, 6))
+    for j in prange(c):
+        s = 0.0
+        for i in range(n):
+            s += data[i, j]
+        m = s / n
+        acc = 0.0
+        mn = data[0, j]
+        mx = data[0, j]
+        for i in range(n):
+            v = data[i, j]
+            d = v - m
+            acc += d * d
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+        var = acc / n
+        out[j, 0] = m
+        out[j, 1] = np.sqrt(var)
+        out[j, 2] = mn
+        out[j, 3] = mx
+        out[j, 4] = np.median(data[:, j])
+        out[j, 5] = var
+    return out
+
 def calculate_statistics(data, channel_names):
-    """Calcula estatísticas básicas dos canais"""
-    stats_data = []
-    
-    for i, channel_name in enumerate(channel_names):
-        channel_data = data[:, i]
-        stats_data.append({
-            'Canal': channel_name,
-            'Média': np.mean(channel_data),
-            'Desvio Padrão': np.std(channel_data),
-            'Mínimo': np.min(channel_data),
-            'Máximo': np.max(channel_data),
-            'Mediana': np.median(channel_data),
-            'Variância': np.var(channel_data)
-        })
-    
-    return pd.DataFrame(stats_data)
+    """Calcula estatísticas básicas dos canais (vetorizado sobre a matriz 2D)"""
+    if data.ndim == 1:
+        data = data[:, None]
+
+    if data.shape[1] >= WIDE_CHANNEL_THRESHOLD:
+        # Matrizes largas (ex.: EEG 64 canais): reduz os canais em paralelo
+        stats = _channel_stats(np.ascontiguousarray(data))
+        means, stds, mins, maxs, medians, variances = stats.T
+    else:
+        # Poucos canais: caminho serial vetorizado do NumPy
+        # Média, variância e desvio compartilham a mesma passagem de desvios
+        means = data.mean(axis=0)
+        diffs = data - means
+        variances = (diffs * diffs).mean(axis=0)
+        stds = np.sqrt(variances)
+        mins = data.min(axis=0)
+        maxs = data.max(axis=0)
+        medians = np.median(data, axis=0)
+
+    return pd.DataFrame({
+        'Canal': channel_names,
+        'Média': means,
+        'Desvio Padrão': stds,
+        'Mínimo': mins,
+        'Máximo': maxs,
+        'Mediana': medians,
+        'Variância': variances
+    })
 
 # Seção principal
 st.markdown('<div class="section-header"><h2>📁 Upload do Arquivo HDF5</h2></div>', unsafe_allow_html=True)
@@ -183,185 +338,215 @@ uploaded_file = st.file_uploader(
 )
 
 if uploaded_file is not None:
-    # Salva arquivo temporariamente
-    with open("temp_temporal.h5", "wb") as f:
-        f.write(uploaded_file.read())
+    # Hash do conteúdo usado como chave das caches (sem copiar os bytes)
+    file_key = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+
+    # Caminho temporário derivado do conteúdo, no diretório temp do sistema:
+    # o arquivo é escrito uma única vez por upload e nunca é removido ou
+    # reescrito enquanto o handle cacheado (st.cache_resource) ainda o
+    # mantém aberto — no Windows isso falharia
+    tmp_path = os.path.join(tempfile.gettempdir(), f"temp_temporal_{file_key}.h5")
+
+    # Upload novo: fecha o handle cacheado do arquivo anterior antes de
+    # removê-lo, para não acumular um .h5 por upload no disco
+    prev = st.session_state.get("temporal_tmp")
+    if prev is not None and prev[1] != tmp_path:
+        prev_key, prev_path = prev
+        try:
+            open_h5_file(prev_key, prev_path).close()
+        except Exception:
+            pass
+        open_h5_file.clear()
+        if os.path.exists(prev_path):
+            try:
+                os.remove(prev_path)
+            except OSError:
+                pass
+    st.session_state["temporal_tmp"] = (file_key, tmp_path)
+
+    if not os.path.exists(tmp_path):
+        # Transfere o upload para disco em blocos de 1 MiB, sem materializar
+        # uma cópia integral em bytes no processo
+        uploaded_file.seek(0)
+        with open(tmp_path, "wb") as f:
+            shutil.copyfileobj(uploaded_file, f, length=1 << 20)
+
+    # Abre arquivo HDF5: handle compartilhado (st.cache_resource) com
+    # chunk cache ampliado, reutilizado entre reruns
+    hdf = open_h5_file(file_key, tmp_path)
+
+    # Encontra datasets temporais (cacheado por conteúdo do arquivo)
+    temporal_datasets = scan_temporal_datasets(file_key, tmp_path)
     
-    # Abre arquivo HDF5
-    with h5py.File("temp_temporal.h5", "r") as hdf:
+    if not temporal_datasets:
+        st.error("❌ Nenhum dataset temporal encontrado no arquivo!")
+        st.info("📝 Datasets temporais devem ser 2D com primeira coluna crescente (tempo)")
+    else:
+        st.success(f"✅ Encontrados {len(temporal_datasets)} datasets temporais no arquivo")
         
-        # Encontra datasets temporais
-        temporal_datasets = find_temporal_datasets(hdf)
+        # Seção de seleção de dataset
+        st.markdown('<div class="section-header"><h2>🎯 Seleção do Dataset</h2></div>', unsafe_allow_html=True)
         
-        if not temporal_datasets:
-            st.error("❌ Nenhum dataset temporal encontrado no arquivo!")
-            st.info("📝 Datasets temporais devem ser 2D com primeira coluna crescente (tempo)")
-        else:
-            st.success(f"✅ Encontrados {len(temporal_datasets)} datasets temporais no arquivo")
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            # Lista datasets encontrados
+            dataset_options = []
+            for ds in temporal_datasets:
+                label = f"{ds['path']} ({ds['channels']} canais, {ds['shape'][0]} amostras)"
+                dataset_options.append(label)
             
-            # Seção de seleção de dataset
-            st.markdown('<div class="section-header"><h2>🎯 Seleção do Dataset</h2></div>', unsafe_allow_html=True)
+            selected_dataset_idx = st.selectbox(
+                "Escolha o dataset para análise:",
+                range(len(dataset_options)),
+                format_func=lambda x: dataset_options[x]
+            )
             
-            col1, col2 = st.columns([1, 2])
+            selected_dataset_info = temporal_datasets[selected_dataset_idx]
+            dataset_path = selected_dataset_info['path']
             
-            with col1:
-                # Lista datasets encontrados
-                dataset_options = []
-                for ds in temporal_datasets:
-                    label = f"{ds['path']} ({ds['channels']} canais, {ds['shape'][0]} amostras)"
-                    dataset_options.append(label)
-                
-                selected_dataset_idx = st.selectbox(
-                    "Escolha o dataset para análise:",
-                    range(len(dataset_options)),
-                    format_func=lambda x: dataset_options[x]
-                )
-                
-                selected_dataset_info = temporal_datasets[selected_dataset_idx]
-                dataset_path = selected_dataset_info['path']
-                
-                # Informações do dataset
-                st.markdown("**Informações do Dataset:**")
-                st.write(f"📊 Shape: {selected_dataset_info['shape']}")
-                st.write(f"🔢 Tipo: {selected_dataset_info['dtype']}")
-                st.write(f"📈 Canais: {selected_dataset_info['channels']}")
+            # Informações do dataset
+            st.markdown("**Informações do Dataset:**")
+            st.write(f"📊 Shape: {selected_dataset_info['shape']}")
+            st.write(f"🔢 Tipo: {selected_dataset_info['dtype']}")
+            st.write(f"📈 Canais: {selected_dataset_info['channels']}")
+        
+        with col2:                # Carrega dados do dataset selecionado
+            dataset = hdf[dataset_path]
             
-            with col2:                # Carrega dados do dataset selecionado
-                dataset = hdf[dataset_path]
-                
-                # Informações sobre o dataset original
-                total_samples = dataset.shape[0]
-                
-                # Aplicar limite de amostras se habilitado (otimização de leitura)
-                if use_sample_limit and max_samples and total_samples > max_samples:
-                    # Lê apenas as amostras necessárias do HDF5 (otimização de memória)
-                    data = dataset[:max_samples, :]
+            # Informações sobre o dataset original
+            total_samples = dataset.shape[0]
+            limit = max_samples if use_sample_limit else None
+
+            if use_sample_limit and max_samples:
+                if total_samples > max_samples:
                     st.info(f"📊 Limitador ativo: Exibindo {max_samples:,} de {total_samples:,} amostras")
-                    samples_used = max_samples
                 else:
-                    # Carrega todos os dados
-                    data = dataset[()]
-                    samples_used = total_samples
-                    if use_sample_limit and max_samples:
-                        st.info(f"📊 Dataset menor que o limite: Exibindo todas as {total_samples:,} amostras")
-                  # Separar tempo e canais
-                time_column = data[:, 0]
-                channels_data = data[:, 1:]
-                
-                # Obter nomes dos canais
-                channel_names = get_channel_names(dataset, dataset_path)
+                    st.info(f"📊 Dataset menor que o limite: Exibindo todas as {total_samples:,} amostras")
+            
+            # Obter nomes dos canais e índice por nome (lookup O(1))
+            channel_names = get_channel_names(file_key, tmp_path, dataset_path)
+            name_to_idx = {nome: i for i, nome in enumerate(channel_names)}
+            
+            # Seleção de canais
+            st.markdown('<div class="section-header"><h3>🎛️ Seleção de Canais</h3></div>', unsafe_allow_html=True)
+            
+            selected_channels = st.multiselect(
+                "Escolha os canais para visualização:",
+                options=channel_names,
+                default=channel_names[:min(3, len(channel_names))],
+                help="Selecione um ou mais canais para análise"
+            )
+            
+            if selected_channels:
+                # Lê do HDF5 apenas a coluna de tempo e os canais escolhidos
+                # (hyperslab de colunas em vez de fatiar em memória)
+                selected_indices = sorted(name_to_idx[ch] for ch in selected_channels)
+                time_column, selected_data = load_dataset_payload(
+                    file_key, tmp_path, dataset_path, limit, tuple(selected_indices))
+                samples_used = len(time_column)
+
+                # Nomes e índice por coluna dos canais efetivamente carregados
+                loaded_names = [channel_names[i] for i in selected_indices]
+                name_to_col = {nome: i for i, nome in enumerate(loaded_names)}
+
+                # Seção de visualização
+                st.markdown('<div class="section-header"><h2>📈 Visualização</h2></div>', unsafe_allow_html=True)
+
+                # Informação sobre amostras no gráfico
+                samples_info = f"{samples_used:,} amostras" if use_sample_limit and max_samples else ""
+
+                # Criar gráfico
+                fig = create_time_series_plot(time_column, selected_data, name_to_col, loaded_names, samples_info)
+                st.plotly_chart(fig, use_container_width=True)
+
+                # Seção de estatísticas
+                st.markdown('<div class="section-header"><h2>📊 Estatísticas</h2></div>', unsafe_allow_html=True)
+
+                # Calcular estatísticas
+                stats_df = calculate_statistics(selected_data, loaded_names)
                 
-                # Seleção de canais
-                st.markdown('<div class="section-header"><h3>🎛️ Seleção de Canais</h3></div>', unsafe_allow_html=True)
+                # Exibir estatísticas em colunas
+                col_stats1, col_stats2 = st.columns(2)
                 
-                selected_channels = st.multiselect(
-                    "Escolha os canais para visualização:",
-                    options=channel_names,
-                    default=channel_names[:min(3, len(channel_names))],
-                    help="Selecione um ou mais canais para análise"
-                )
+                with col_stats1:
+                    st.subheader("📋 Resumo Estatístico")
+                    st.dataframe(stats_df.round(4), use_container_width=True)
                 
-                if selected_channels:                    # Seção de visualização
-                    st.markdown('<div class="section-header"><h2>📈 Visualização</h2></div>', unsafe_allow_html=True)
-                    
-                    # Informação sobre amostras no gráfico
-                    samples_info = f"{samples_used:,} amostras" if use_sample_limit and max_samples else ""
-                    
-                    # Criar gráfico
-                    fig = create_time_series_plot(time_column, channels_data, channel_names, selected_channels, samples_info)
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Seção de estatísticas
-                    st.markdown('<div class="section-header"><h2>📊 Estatísticas</h2></div>', unsafe_allow_html=True)
-                    
-                    # Filtrar dados dos canais selecionados
-                    selected_indices = [channel_names.index(ch) for ch in selected_channels]
-                    selected_data = channels_data[:, selected_indices]
-                    
-                    # Calcular estatísticas
-                    stats_df = calculate_statistics(selected_data, selected_channels)
-                    
-                    # Exibir estatísticas em colunas
-                    col_stats1, col_stats2 = st.columns(2)
-                    
-                    with col_stats1:
-                        st.subheader("📋 Resumo Estatístico")
-                        st.dataframe(stats_df.round(4), use_container_width=True)
-                    
-                    with col_stats2:
-                        st.subheader("📊 Métricas Principais")
-                        for _, row in stats_df.iterrows():
-                            st.metric(
-                                label=f"{row['Canal']} - Média",
-                                value=f"{row['Média']:.4f}",
-                                delta=f"σ = {row['Desvio Padrão']:.4f}"
-                            )
-                      # Seção de download
-                    st.markdown('<div class="section-header"><h2>💾 Download dos Dados</h2></div>', unsafe_allow_html=True)
-                    
-                    col_down1, col_down2 = st.columns(2)
-                    
-                    with col_down1:
-                        # Preparar dados para download (incluindo informação de limitação)
-                        download_data = np.column_stack([time_column, selected_data])
-                        download_columns = ['Tempo'] + selected_channels
-                        download_df = pd.DataFrame(download_data, columns=download_columns)
-                        
-                        # Adicionar informação sobre limitação no nome do arquivo
-                        filename_suffix = f"_limited_{samples_used}" if use_sample_limit and max_samples else f"_full_{samples_used}"
-                        
-                        csv = download_df.to_csv(index=False)
-                        st.download_button(
-                            label=f"📥 Download Dados Selecionados (CSV)",
-                            data=csv,
-                            file_name=f"series_temporais{filename_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv",
-                            help=f"Baixar {len(download_df)} amostras dos canais selecionados"
-                        )
-                    
-                    with col_down2:
-                        # Download das estatísticas
-                        stats_csv = stats_df.to_csv(index=False)
-                        st.download_button(
-                            label="📊 Download Estatísticas (CSV)",
-                            data=stats_csv,
-                            file_name=f"estatisticas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                            mime="text/csv"
+                with col_stats2:
+                    st.subheader("📊 Métricas Principais")
+                    # zip sobre os arrays já vetorizados, sem iterrows
+                    for canal, media, desvio in zip(stats_df['Canal'].to_numpy(),
+                                                    stats_df['Média'].to_numpy(),
+                                                    stats_df['Desvio Padrão'].to_numpy()):
+                        st.metric(
+                            label=f"{canal} - Média",
+                            value=f"{media:.4f}",
+                            delta=f"σ = {desvio:.4f}"
                         )
+                  # Seção de download
+                st.markdown('<div class="section-header"><h2>💾 Download dos Dados</h2></div>', unsafe_allow_html=True)
+                
+                col_down1, col_down2 = st.columns(2)
+                
+                with col_down1:
+                    # Preparar dados para download (incluindo informação de limitação)
+                    download_data = np.column_stack([time_column, selected_data])
+                    download_columns = ['Tempo'] + loaded_names
+                    download_df = pd.DataFrame(download_data, columns=download_columns)
                     
-                    # Seção de atributos
-                    st.markdown('<div class="section-header"><h2>🏷️ Atributos do Dataset</h2></div>', unsafe_allow_html=True)
+                    # Adicionar informação sobre limitação no nome do arquivo
+                    filename_suffix = f"_limited_{samples_used}" if use_sample_limit and max_samples else f"_full_{samples_used}"
                     
-                    if dataset.attrs:
-                        attr_data = {}
-                        for key in dataset.attrs.keys():
-                            value = dataset.attrs[key]
-                            if isinstance(value, bytes):
-                                value = value.decode("utf-8")
-                            elif isinstance(value, np.ndarray):
-                                value = value.tolist()
-                            attr_data[key] = str(value)
-                        
-                        attr_df = pd.DataFrame(attr_data.items(), columns=["Atributo", "Valor"])
-                        st.dataframe(attr_df, use_container_width=True)
-                        
-                        # Download dos atributos
-                        attr_csv = attr_df.to_csv(index=False)
-                        st.download_button(
-                            label="🏷️ Download Atributos (CSV)",
-                            data=attr_csv,
-                            file_name=f"atributos_{dataset_path.replace('/', '_')}.csv",
-                            mime="text/csv"
-                        )
-                    else:
-                        st.info("ℹ️ Nenhum atributo encontrado para este dataset")
+                    csv = dataframe_to_csv(download_df)
+                    st.download_button(
+                        label=f"📥 Download Dados Selecionados (CSV)",
+                        data=csv,
+                        file_name=f"series_temporais{filename_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv",
+                        help=f"Baixar {len(download_df)} amostras dos canais selecionados"
+                    )
+                
+                with col_down2:
+                    # Download das estatísticas
+                    stats_csv = dataframe_to_csv(stats_df)
+                    st.download_button(
+                        label="📊 Download Estatísticas (CSV)",
+                        data=stats_csv,
+                        file_name=f"estatisticas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv"
+                    )
+                
+                # Seção de atributos
+                st.markdown('<div class="section-header"><h2>🏷️ Atributos do Dataset</h2></div>', unsafe_allow_html=True)
                 
+                if len(dataset.attrs):
+                    # Busca todos os atributos de uma vez pelo iterador C
+                    def _attr_str(value):
+                        if isinstance(value, bytes):
+                            return value.decode("utf-8", "replace")
+                        if isinstance(value, np.ndarray):
+                            return str(value.tolist())
+                        return str(value)
+
+                    attr_data = {key: _attr_str(value) for key, value in dataset.attrs.items()}
+
+                    attr_df = pd.DataFrame(attr_data.items(), columns=["Atributo", "Valor"])
+                    st.dataframe(attr_df, use_container_width=True)
+                    
+                    # Download dos atributos
+                    attr_csv = dataframe_to_csv(attr_df)
+                    st.download_button(
+                        label="🏷️ Download Atributos (CSV)",
+                        data=attr_csv,
+                        file_name=f"atributos_{dataset_path.replace('/', '_')}.csv",
+                        mime="text/csv"
+                    )
                 else:
-                    st.warning("⚠️ Selecione pelo menos um canal para visualização")
-    
-    # Limpeza do arquivo temporário
-    if os.path.exists("temp_temporal.h5"):
-        os.remove("temp_temporal.h5")
+                    st.info("ℹ️ Nenhum atributo encontrado para este dataset")
+            
+            else:
+                st.warning("⚠️ Selecione pelo menos um canal para visualização")
 
 else:
     # Página de boas-vindas
@@ -0,0 +1,95 @@
+import numpy as np
+from numba import njit, prange
+
+# Maximum number of points handed to Plotly per trace
+MAX_PLOT_POINTS = 2000
+
+@njit(cache=True)
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Selects n_out representative points that preserve the visual shape of
+    the series (peaks and valleys), unlike a plain truncation.
+    """
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return x.copy(), y.copy()
+
+    x_out = np.empty(n_out, dtype=x.dtype)
+    y_out = np.empty(n_out, dtype=y.dtype)
+    x_out[0] = x[0]
+    y_out[0] = y[0]
+
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Point C: average of the next bucket
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(next_start, next_end):
+            avg_x += x[j]
+            avg_y += y[j]
+        m = next_end - next_start
+        avg_x /= m
+        avg_y /= m
+
+        # Current bucket: pick the point forming the largest triangle
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax = x[a]
+        ay = y[a]
+        max_area = -1.0
+        chosen = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                chosen = j
+        x_out[i + 1] = x[chosen]
+        y_out[i + 1] = y[chosen]
+        a = chosen
+
+    x_out[n_out - 1] = x[n - 1]
+    y_out[n_out - 1] = y[n - 1]
+    return x_out, y_out
+
+@njit(parallel=True, cache=True)
+def minmax_envelope(y, n_buckets):
+    """Per-bucket min/max envelope of a 1-D series.
+
+    Reduces the series to 2*n_buckets points while keeping the full
+    vertical extent of every pixel column, so spikes stay visible.
+    Buckets are independent, so they reduce in parallel across cores.
+    """
+    out_lo = np.empty(n_buckets, dtype=np.float64)
+    out_hi = np.empty(n_buckets, dtype=np.float64)
+    n = y.size
+    step = n / n_buckets
+    for b in prange(n_buckets):
+        start = int(b * step)
+        end = int((b + 1) * step)
+        if end > n:
+            end = n
+        if end <= start:
+            end = start + 1
+        lo = y[start]
+        hi = y[start]
+        for j in range(start + 1, end):
+            v = y[j]
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+        out_lo[b] = lo
+        out_hi[b] = hi
+    return out_lo, out_hi
+
+def decimate_for_plot(x, y, n_out=MAX_PLOT_POINTS):
+    """Apply LTTB when the series exceeds n_out points; pass through otherwise."""
+    if y.size > n_out:
+        return lttb(np.ascontiguousarray(x, dtype=np.float64),
+                    np.ascontiguousarray(y, dtype=np.float64),
+                    n_out)
+    return x, y